@@ -3,73 +3,194 @@ Main entry point for the Pulumi EKS project.
 This module initializes the Pulumi stack and orchestrates the deployment
 of all infrastructure components.
 """
-import json
+import mmap
 import os
-from pathlib import Path
+from functools import lru_cache
+from typing import Optional
 import pulumi
 
-# Import infrastructure modules
-from infrastructure.vpc import create_vpc
-from infrastructure.eks import create_eks_cluster
-from infrastructure.iam import create_iam_roles
-from infrastructure.addons import setup_addons
+from infrastructure.config import EksConfig
 
-def load_eks_config() -> dict:
-    """Load EKS configuration from JSON file.
+try:
+    import orjson as _json
+    _LOADS_ACCEPTS_BUFFER = True
+except ImportError:  # stdlib json.loads also accepts bytes, but not memoryview
+    import json as _json
+    _LOADS_ACCEPTS_BUFFER = False
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Resolved once so config lookup does not depend on the working directory
+_HERE = os.path.dirname(os.path.realpath(__file__))
+_CONFIG_DIR = os.path.join(_HERE, 'config')
+
+# Environment selecting the config file; read once per process
+_ENV = os.environ.get('ENV', 'dev')
+
+# Environment-specific config first, falling back to the default
+_CONFIG_PATHS = (
+    os.path.join(_CONFIG_DIR, f'eks-config.{_ENV}.json'),
+    os.path.join(_CONFIG_DIR, 'eks-config.json'),
+)
+_CONFIG_NOT_FOUND = "No EKS config file found. Expected one of: " + ", ".join(_CONFIG_PATHS)
+
+# Config files larger than this are streamed with ijson (when installed) so
+# that only the sections main() reads are materialized
+_STREAM_THRESHOLD = 64 * 1024
+_STREAMED_SECTIONS = ('project', 'eks.node', 'eks.addons', 'eks.karpenter')
+
+# Validated configs keyed by path, checked against (st_mtime_ns, st_size)
+_CONFIG_CACHE: dict[str, tuple[tuple[int, int], EksConfig]] = {}
+
+# Candidate that satisfied the last lookup
+_resolved_path: Optional[str] = None
+
+@lru_cache(maxsize=None)
+def load_eks_config() -> EksConfig:
+    """Load and validate EKS configuration from JSON file.
+    
+    The configuration is loaded once per process. Call
+    ``load_eks_config.cache_clear()`` to pick up changes on disk; the file is
+    then only re-parsed if its mtime or size changed.
     
     Returns:
-        dict: Parsed JSON configuration
+        EksConfig: Validated configuration
     """
-    # First try environment-specific config, fall back to default
-    env = os.environ.get('ENV', 'dev')
-    config_paths = [
-        Path(__file__).parent / 'config' / f'eks-config.{env}.json',
-        Path(__file__).parent / 'config' / 'eks-config.json'
-    ]
+    return _read_eks_config()
+
+def _read_eks_config() -> EksConfig:
+    """Read the first existing config file, reusing the cached parse when unchanged."""
+    global _resolved_path
+    # Once a candidate has been found, open it directly instead of probing
+    # the environment-specific path again; re-probe only if it disappears
+    if _resolved_path is not None:
+        try:
+            return _read_config_file(_resolved_path)
+        except FileNotFoundError:
+            _resolved_path = None
     
-    for config_path in config_paths:
-        if config_path.exists():
-            with open(config_path) as f:
-                return json.load(f)
+    for config_path in _CONFIG_PATHS:
+        try:
+            config = _read_config_file(config_path)
+        except FileNotFoundError:
+            continue
+        _resolved_path = config_path
+        return config
     
-    raise FileNotFoundError("No EKS config file found. Expected one of: " + ", ".join(str(p) for p in config_paths))
+    raise FileNotFoundError(_CONFIG_NOT_FOUND)
+
+def _read_config_file(config_path: str) -> EksConfig:
+    """Parse and validate a single config file, raising FileNotFoundError if absent."""
+    # One open probes for the file; fstat on the same fd yields the cache
+    # key and the read size, so no separate exists()/stat() call
+    fd = os.open(config_path, os.O_RDONLY)
+    try:
+        st = os.fstat(fd)
+        key = (st.st_mtime_ns, st.st_size)
+        cached = _CONFIG_CACHE.get(config_path)
+        if cached and cached[0] == key:
+            return cached[1]
+        if ijson is not None and st.st_size > _STREAM_THRESHOLD:
+            raw = _stream_sections(fd)
+        else:
+            raw = _parse_mapped(fd, st.st_size)
+    finally:
+        os.close(fd)
+    parsed = EksConfig.from_dict(raw)
+    _CONFIG_CACHE[config_path] = (key, parsed)
+    return parsed
+
+def _parse_mapped(fd: int, size: int) -> dict:
+    """Parse the file through a read-only memory map instead of a bytes copy."""
+    if size == 0:
+        # mmap rejects empty files; let the parser raise its usual error
+        return _json.loads(b"")
+    with mmap.mmap(fd, size, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+        return _json.loads(view if _LOADS_ACCEPTS_BUFFER else bytes(view))
+
+def _stream_sections(fd: int) -> dict:
+    """Extract only the used config sections from a large file with ijson.
+    
+    A single pass over the parse events builds each wanted subtree; parsing
+    stops as soon as all of them have been seen.
+    """
+    raw = {}
+    pending = set(_STREAMED_SECTIONS)
+    section = builder = None
+    with os.fdopen(os.dup(fd), 'rb') as f:
+        for prefix, event, value in ijson.parse(f, use_float=True):
+            if builder is None:
+                if prefix not in pending or event in ('map_key', 'end_map', 'end_array'):
+                    continue
+                section, builder = prefix, ijson.ObjectBuilder()
+            builder.event(event, value)
+            # The subtree is complete once its own container closes, or
+            # immediately when the section is a scalar
+            if prefix == section and event not in ('start_map', 'start_array', 'map_key'):
+                *parents, leaf = section.split('.')
+                target = raw
+                for parent in parents:
+                    target = target.setdefault(parent, {})
+                target[leaf] = builder.value
+                pending.discard(section)
+                section = builder = None
+                if not pending:
+                    break
+    return raw
 
 def main():
     """
     Main function that defines and creates the Pulumi stack.
     """
+    # Infrastructure modules pull in the provider SDKs, so they are imported
+    # here rather than at module load to keep load_eks_config importable cheaply
+    from infrastructure.vpc import create_vpc
+    from infrastructure.eks import create_eks_cluster
+    from infrastructure.iam import create_iam_roles
+    from infrastructure.naming import ResourceNames
+    
     # Load configuration
     config = pulumi.Config()
     eks_config = load_eks_config()
     
-    # Get project name from config
-    project_name = eks_config["project"]["name"]
+    # Resolve the region before creating anything so a misconfigured stack
+    # fails fast instead of after the VPC and IAM resources are declared
+    aws_region = config.require("aws-region")
+    
+    # Get project name and the EKS section from config
+    project_name = eks_config.project.name
+    eks_section = eks_config.eks
+    
+    # Resource names are derived from the project name once and shared
+    names = ResourceNames(project_name)
     
     # Create VPC
-    vpc = create_vpc(project_name)
+    vpc = create_vpc(names)
     
-    # Create IAM roles
-    roles = create_iam_roles(project_name)
+    # Create IAM roles; iam-parallel bounds concurrent IAM calls
+    roles = create_iam_roles(names, iam_parallel=config.get_int("iam-parallel", 4))
     
     # Create EKS cluster
     cluster = create_eks_cluster(
-        project_name=project_name,
+        names=names,
         vpc_id=vpc.vpc_id,
         private_subnet_ids=vpc.private_subnet_ids,
         public_subnet_ids=vpc.public_subnet_ids,
         node_role_arn=roles.node_role.arn,
-        node_config=eks_config["eks"]["node"]
+        node_config=eks_section.node
     )
     
     # Set up add-ons if enabled
-    addons_config = eks_config["eks"].get("addons", {})
-    if addons_config.get("enable", True):
-        aws_region = config.require("aws-region")
+    addons_config = eks_section.addons
+    if addons_config.enable:
+        # pulumi_kubernetes and its Helm module are only loaded when needed
+        from infrastructure.addons import setup_addons
         
         # Get Karpenter configuration if enabled
-        karpenter_config = None
-        if addons_config.get("karpenter", False):
-            karpenter_config = eks_config["eks"].get("karpenter", {})
+        karpenter_config = eks_section.karpenter if addons_config.karpenter else None
         
         setup_addons(
             kubeconfig=cluster.kubeconfig,
@@ -80,14 +201,27 @@ def main():
             vpc_id=vpc.vpc_id,
             karpenter_config=karpenter_config,
             oidc_provider_id=cluster.oidc_provider_id,
+            oidc_provider_arn=cluster.oidc_provider_arn,
+            oidc_provider_url=cluster.oidc_provider_url,
             cluster_endpoint=cluster.eks_cluster.core.cluster.endpoint,
             cluster_ca=cluster.eks_cluster.core.cluster.certificate_authority['data']
         )
     
-    # Export values
-    pulumi.export('kubeconfig', cluster.kubeconfig)
-    pulumi.export('cluster_name', cluster.eks_cluster.core.cluster.name)
-    pulumi.export('vpc_id', vpc.vpc_id)
+    # Export values as a single joined output (read with
+    # `pulumi stack output stack`, e.g. `--json | jq .cluster_name`)
+    pulumi.export('stack', pulumi.Output.all(
+        kubeconfig=cluster.kubeconfig,
+        cluster_name=cluster.eks_cluster.core.cluster.name,
+        vpc_id=vpc.vpc_id,
+    ))
+
+# Long-lived processes (e.g. Automation API hosts) can warm the config cache
+# at import so the first main() call is a cache hit
+if os.environ.get("PULUMI_WARM_CONFIG") == "1":
+    try:
+        load_eks_config()
+    except FileNotFoundError:
+        pass
 
 if __name__ == "__main__":
     main()
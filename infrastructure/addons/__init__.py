@@ -9,30 +9,281 @@ for the EKS cluster, including:
 """
 
 import json
+import string
+from functools import lru_cache
+from importlib import resources
 import pulumi
 import pulumi_aws as aws
 import pulumi_kubernetes as k8s
-from pulumi_kubernetes.helm.v3 import Chart, ChartOpts, FetchOpts
-from pulumi_kubernetes.core.v1 import Namespace, ServiceAccount
-from pulumi_kubernetes.yaml import ConfigGroup
-from pulumi_kubernetes.apiextensions import CustomResource
-from pulumi_kubernetes.meta.v1 import ObjectMetaArgs
-from pulumi_kubernetes.provider import Provider
+from pulumi_kubernetes.helm.v3 import Release, ReleaseArgs, RepositoryOptsArgs
+
+from infrastructure.config import AddonsConfig
+
+# Karpenter controller IAM policy, kept as a JSON asset beside this module.
+# ${region} and ${partition} are filled in per cluster by _karpenter_policy().
+_KARPENTER_POLICY_TEMPLATE = string.Template(
+    resources.files(__package__).joinpath("karpenter_policy.json").read_text()
+)
+
+def _irsa_trust_template(service_account: str) -> str:
+    """IRSA trust policy for ``service_account`` (``namespace:name``).
+    
+    Serialized compactly, with the JSON braces escaped so the ``{oidc_arn}``
+    and ``{oidc_url}`` fields can be filled in through Output.format.
+    """
+    return (
+        json.dumps({
+            "Version": "2012-10-17",
+            "Statement": [
+                {
+                    "Effect": "Allow",
+                    "Principal": {
+                        "Federated": "<oidc_arn>"
+                    },
+                    "Action": "sts:AssumeRoleWithWebIdentity",
+                    "Condition": {
+                        "StringEquals": {
+                            "<oidc_url>:aud": "sts.amazonaws.com",
+                            "<oidc_url>:sub": f"system:serviceaccount:{service_account}"
+                        }
+                    }
+                }
+            ]
+        }, separators=(",", ":"))
+        # Escape the JSON braces, then turn the markers into format fields
+        .replace("{", "{{").replace("}", "}}")
+        .replace("<oidc_arn>", "{oidc_arn}")
+        .replace("<oidc_url>", "{oidc_url}")
+    )
+
+# Trust policies of the IRSA roles created here, serialized once
+_KARPENTER_TRUST_TEMPLATE = _irsa_trust_template("karpenter:karpenter")
+_EBS_CSI_TRUST_TEMPLATE = _irsa_trust_template("kube-system:ebs-csi-controller-sa")
+
+# Karpenter controller requests and limits; never mutated
+_KARPENTER_RESOURCES = {
+    "limits": {"cpu": "1", "memory": "1Gi"},
+    "requests": {"cpu": "1", "memory": "1Gi"},
+}
+
+# Pod scheduling fragments shared by add-on values; never mutated
+_LINUX_NODE_SELECTOR = {"kubernetes.io/os": "linux"}
+_CRITICAL_TOLERATION = [{"key": "CriticalAddonsOnly", "operator": "Exists"}]
+
+def _anti_affinity(label_key: str, label_values: list, required: bool = False) -> dict:
+    """Build a podAntiAffinity that spreads matching pods across nodes.
+    
+    Args:
+        label_key: Pod label to match on
+        label_values: Label values identifying the pods to spread
+        required: Use a hard (required) rule instead of a weighted preference
+    """
+    term = {
+        "labelSelector": {
+            "matchExpressions": [
+                {"key": label_key, "operator": "In", "values": label_values}
+            ]
+        },
+        "topologyKey": "kubernetes.io/hostname",
+    }
+    if required:
+        rules = {"requiredDuringSchedulingIgnoredDuringExecution": [term]}
+    else:
+        rules = {"preferredDuringSchedulingIgnoredDuringExecution": [{"weight": 100, "podAffinityTerm": term}]}
+    return {"podAntiAffinity": rules}
+
+# AWS accounts hosting the EKS add-on images in each region's ECR, as
+# published in "Amazon container image registries" in the EKS User Guide.
+# Regions not listed use the default account.
+_EKS_ECR_DEFAULT_ACCOUNT = "602401143452"
+_EKS_ECR_ACCOUNTS = {
+    "af-south-1": "877085696533",
+    "ap-east-1": "800184023465",
+    "ap-south-2": "900889452093",
+    "ap-southeast-3": "296578399912",
+    "ap-southeast-4": "491585149902",
+    "cn-north-1": "918309763551",
+    "cn-northwest-1": "961992271922",
+    "eu-central-2": "900612956339",
+    "eu-south-1": "590381155156",
+    "eu-south-2": "455263428931",
+    "il-central-1": "066635153087",
+    "me-central-1": "759879836304",
+    "me-south-1": "558608220178",
+    "us-gov-east-1": "151742754352",
+    "us-gov-west-1": "013241004608",
+}
+
+def _aws_partition(aws_region: str) -> str:
+    """Return the AWS partition that ``aws_region`` belongs to."""
+    if aws_region.startswith("cn-"):
+        return "aws-cn"
+    if aws_region.startswith("us-gov-"):
+        return "aws-us-gov"
+    return "aws"
+
+@lru_cache(maxsize=None)
+def _karpenter_policy(aws_region: str) -> str:
+    """Karpenter's IAM policy scoped to ``aws_region``, serialized compactly."""
+    document = _KARPENTER_POLICY_TEMPLATE.substitute(region=aws_region, partition=_aws_partition(aws_region))
+    return json.dumps(json.loads(document), separators=(",", ":"))
+
+def _oidc_issuer(aws_region: str, account_id, oidc_provider_id=None, oidc_provider_arn=None,
+                 oidc_provider_url=None) -> tuple:
+    """Return the cluster OIDC provider's ``(arn, issuer url)`` for IRSA trust policies.
+    
+    When only the provider ID is known, the issuer and ARN are derived from it.
+    """
+    if oidc_provider_url is None:
+        oidc_provider_url = pulumi.Output.concat("oidc.eks.", aws_region, ".amazonaws.com/id/", oidc_provider_id)
+    if oidc_provider_arn is None:
+        oidc_provider_arn = pulumi.Output.concat(
+            "arn:", _aws_partition(aws_region), ":iam::", account_id, ":oidc-provider/", oidc_provider_url
+        )
+    return oidc_provider_arn, oidc_provider_url
+
+def _eks_ecr_registry(aws_region: str) -> str:
+    """Return the ECR registry host serving EKS add-on images in ``aws_region``."""
+    account = _EKS_ECR_ACCOUNTS.get(aws_region, _EKS_ECR_DEFAULT_ACCOUNT)
+    suffix = ".cn" if aws_region.startswith("cn-") else ""
+    return f"{account}.dkr.ecr.{aws_region}.amazonaws.com{suffix}"
+
+# EBS CSI driver image and tag, and the sidecars as (values key, image, tag)
+_EBS_CSI_IMAGE = ("aws-ebs-csi-driver", "v1.5.0")
+_EBS_CSI_SIDECARS = (
+    ("provisioner", "csi-provisioner", "v2.2.1"),
+    ("attacher", "csi-attacher", "v3.2.0"),
+    ("snapshotter", "csi-snapshotter", "v4.2.0"),
+    ("resizer", "csi-resizer", "v1.2.0"),
+    ("livenessProbe", "csi-livenessprobe", "v2.3.0"),
+    ("nodeDriverRegistrar", "csi-node-driver-registrar", "v2.2.0"),
+)
+
+def _ebs_csi_images(ecr_prefix: str) -> dict:
+    """Controller image and sidecar overrides pointing at ``ecr_prefix``."""
+    image, tag = _EBS_CSI_IMAGE
+    return {
+        "image": {"repository": f"{ecr_prefix}/eks/{image}", "tag": tag},
+        "sidecars": {
+            key: {"image": {"repository": f"{ecr_prefix}/eks/{image}", "tag": tag}}
+            for key, image, tag in _EBS_CSI_SIDECARS
+        },
+    }
+
+# Static parts of the EBS CSI driver values, built once at import. Only the
+# region, image registry and IRSA role ARN vary per call; never mutated
+_EBS_CSI_CONTROLLER_BASE = {
+    "affinity": _anti_affinity("app", ["ebs-csi-controller"]),
+    "tolerations": _CRITICAL_TOLERATION,
+    "nodeSelector": _LINUX_NODE_SELECTOR,
+    "resources": {
+        "requests": {
+            "cpu": "200m",
+            "memory": "200Mi"
+        },
+        "limits": {
+            "cpu": "500m",
+            "memory": "500Mi"
+        }
+    }
+}
+
+_EBS_CSI_NODE = {
+    "tolerations": _CRITICAL_TOLERATION,
+    "nodeSelector": _LINUX_NODE_SELECTOR,
+    "resources": {
+        "requests": {
+            "cpu": "50m",
+            "memory": "100Mi"
+        },
+        "limits": {
+            "cpu": "200m",
+            "memory": "200Mi"
+        }
+    }
+}
+
+def _storage_class(name: str, default: bool, **parameters) -> dict:
+    """Build an EBS StorageClass entry for the driver chart's ``storageClasses``."""
+    return {
+        "name": name,
+        "annotations": {
+            "storageclass.kubernetes.io/is-default-class": "true" if default else "false"
+        },
+        "volumeBindingMode": "WaitForFirstConsumer",
+        "reclaimPolicy": "Delete",
+        "parameters": parameters,
+    }
+
+# (name, is default class, StorageClass parameters)
+_EBS_CSI_STORAGE_CLASS_SPECS = (
+    ("gp3", True, {"type": "gp3", "encrypted": "true"}),
+    ("gp3-encrypted", False, {"type": "gp3", "encrypted": "true"}),
+    ("sc1", False, {"type": "sc1"}),
+    ("st1", False, {"type": "st1"}),
+    ("io1", False, {"type": "io1"}),
+)
+
+_EBS_CSI_STORAGE_CLASSES = [
+    _storage_class(name, default, **parameters)
+    for name, default, parameters in _EBS_CSI_STORAGE_CLASS_SPECS
+]
+
+def _chart_source(chart: str, repo: str) -> dict:
+    """Return the ReleaseArgs fields locating ``chart`` in ``repo``.
+    
+    OCI registries (``oci://...``) are referenced directly, which skips
+    downloading and parsing a repository index; HTTP repositories go
+    through ``repository_opts``.
+    """
+    if repo.startswith("oci://"):
+        return {"chart": f"{repo.rstrip('/')}/{chart}"}
+    return {"chart": chart, "repository_opts": RepositoryOptsArgs(repo=repo)}
+
+# Providers created by setup_addons, keyed by id() of their kubeconfig Output.
+# The Output is kept alongside so its id cannot be reused by another object.
+_PROVIDERS: dict[int, tuple[pulumi.Output, k8s.Provider]] = {}
+
+def _cluster_provider(kubeconfig: pulumi.Output[str]) -> k8s.Provider:
+    """Return the Kubernetes provider for ``kubeconfig``, creating it once."""
+    cached = _PROVIDERS.get(id(kubeconfig))
+    if cached is not None:
+        return cached[1]
+    provider = k8s.Provider(
+        "k8s-provider",
+        kubeconfig=kubeconfig,
+        enable_server_side_apply=True,
+    )
+    _PROVIDERS[id(kubeconfig)] = (kubeconfig, provider)
+    return provider
+
+@lru_cache(maxsize=1)
+def _account_id() -> pulumi.Output[str]:
+    """AWS account ID of the deploying credentials, looked up once per process."""
+    return aws.get_caller_identity_output().account_id
 
 def setup_addons(
     kubeconfig: pulumi.Output[str], 
     project_name: str, 
     aws_region: str,
-    addons_config: dict,
+    addons_config: AddonsConfig,
     cluster_name: str,
     vpc_id: str,
     karpenter_config: dict = None,
     oidc_provider_id: str = None,
     cluster_endpoint=None,
-    cluster_ca=None
-) -> None:
+    cluster_ca=None,
+    provider: k8s.Provider = None,
+    oidc_provider_arn: pulumi.Output[str] = None,
+    oidc_provider_url: pulumi.Output[str] = None,
+) -> dict:
     """Install all configured Kubernetes add-ons for the EKS cluster.
     
+    The add-ons have no ordering constraints between them, so no
+    ``depends_on`` edges are declared and the engine installs them
+    concurrently. Each helper returns its resources so that anything that
+    genuinely depends on an add-on can reference it.
+    
     Args:
         kubeconfig: The kubeconfig for the EKS cluster
         project_name: Name of the project for resource naming
@@ -41,45 +292,62 @@ def setup_addons(
         cluster_name: Name of the EKS cluster
         vpc_id: The VPC ID where the EKS cluster is deployed
         karpenter_config: Configuration for Karpenter (optional)
+        provider: An existing Kubernetes provider for the cluster (optional).
+            Pass one when installing into a cluster that already has a
+            provider, to avoid configuring a second one.
+        oidc_provider_arn: ARN of the cluster's IAM OIDC provider (optional)
+        oidc_provider_url: Issuer of the cluster's IAM OIDC provider, without
+            the scheme (optional)
+        
+    Returns:
+        dict: Installed add-on resources keyed by add-on name
     """
-    # Create a Kubernetes provider instance
-    k8s_provider = k8s.Provider(
-        "k8s-provider",
-        kubeconfig=kubeconfig,
-        enable_server_side_apply=True
-    )
+    # Resolve the AWS account ID once for every IRSA role ARN below
+    account_id = _account_id()
     
-    # Install Metrics Server (enabled by default)
-    if addons_config.get("metricsServer", True):
-        _install_metrics_server(k8s_provider, project_name)
+    # Create a Kubernetes provider instance unless the caller supplied one
+    k8s_provider = provider or _cluster_provider(kubeconfig)
     
-    # Install AWS EBS CSI Driver if enabled
-    if addons_config.get("ebsCsiDriver", True):
-        _install_ebs_csi_driver(k8s_provider, project_name, aws_region)
+    # Arguments available to the installers in _ADDON_REGISTRY
+    context = {
+        "provider": k8s_provider,
+        "project_name": project_name,
+        "aws_region": aws_region,
+        "account_id": account_id,
+        "cluster_name": cluster_name,
+        "karpenter_config": karpenter_config,
+        "oidc_provider_id": oidc_provider_id,
+        "oidc_provider_arn": oidc_provider_arn,
+        "oidc_provider_url": oidc_provider_url,
+        "cluster_endpoint": cluster_endpoint,
+        "cluster_ca": cluster_ca,
+        "ebs_csi_mirror": addons_config.ebs_csi_private_mirror,
+    }
     
-    # Install Karpenter if enabled
-    if addons_config.get("karpenter", False) and karpenter_config:
-        _install_karpenter(
-            k8s_provider, project_name, aws_region, cluster_name, karpenter_config, oidc_provider_id,
-            cluster_endpoint=cluster_endpoint, cluster_ca=cluster_ca
-        )
+    installed = {}
+    for name, install, arg_names, required in _ADDON_REGISTRY:
+        if not getattr(addons_config, name) or not all(context[r] for r in required):
+            continue
+        installed[name] = install(**{arg: context[arg] for arg in arg_names})
+    
+    return installed
 
-def _install_metrics_server(provider, project_name: str) -> None:
+def _install_metrics_server(provider, project_name: str) -> Release:
     """Install Metrics Server for Kubernetes metrics aggregation."""
-    Chart(
+    return Release(
         "metrics-server",
-        ChartOpts(
-            chart="metrics-server",
+        ReleaseArgs(
+            name="metrics-server",
             version="3.8.2",
-            fetch_opts=FetchOpts(
-                repo="https://kubernetes-sigs.github.io/metrics-server",
-            ),
+            **_chart_source("metrics-server", "https://kubernetes-sigs.github.io/metrics-server"),
             namespace="kube-system",
+            # Nothing depends on metrics-server being ready
+            skip_await=True,
         ),
         opts=pulumi.ResourceOptions(provider=provider),
     )
 
-def _install_karpenter(provider, project_name: str, aws_region: str, cluster_name: str, karpenter_config: dict, oidc_provider_id: str = None, cluster_endpoint=None, cluster_ca=None) -> None:
+def _install_karpenter(provider, project_name: str, aws_region: str, cluster_name: str, karpenter_config: dict, account_id: pulumi.Output[str], oidc_provider_id: str = None, cluster_endpoint=None, cluster_ca=None, oidc_provider_arn=None, oidc_provider_url=None) -> dict:
     """Install Karpenter for node autoscaling.
     
     Args:
@@ -88,14 +356,13 @@ def _install_karpenter(provider, project_name: str, aws_region: str, cluster_nam
         aws_region: AWS region where the cluster is deployed
         cluster_name: Name of the EKS cluster
         karpenter_config: Configuration for Karpenter
+        account_id: The AWS account ID the cluster runs in
         oidc_provider_id: The OIDC provider ID for the EKS cluster
         cluster_endpoint: The endpoint URL for the EKS cluster
         cluster_ca: The base64-encoded CA certificate for the EKS cluster
+        oidc_provider_arn: ARN of the cluster's IAM OIDC provider
+        oidc_provider_url: Issuer of the cluster's IAM OIDC provider, without the scheme
     """
-    import pulumi_aws as aws
-    import pulumi_kubernetes as k8s
-    import json
-    
     # Create Karpenter namespace
     ns = k8s.core.v1.Namespace(
         "karpenter",
@@ -103,53 +370,16 @@ def _install_karpenter(provider, project_name: str, aws_region: str, cluster_nam
         opts=pulumi.ResourceOptions(provider=provider)
     )
     
-    # Get AWS account ID
-    account_id = aws.get_caller_identity().account_id
-    
-    # Create IAM policy for Karpenter
-    policy_doc = {
-        "Version": "2012-10-17",
-        "Statement": [
-            {
-                "Effect": "Allow",
-                "Action": [
-                    "ec2:RunInstances", "ec2:CreateLaunchTemplate", "ec2:CreateFleet",
-                    "ec2:TerminateInstances", "ec2:DescribeInstances", "ec2:DescribeInstanceTypes",
-                    "ec2:DescribeLaunchTemplates", "ec2:DescribeSubnets", "ec2:DescribeSecurityGroups",
-                    "ec2:DescribeInstanceTypeOfferings", "ec2:DescribeSpotPriceHistory",
-                    "pricing:GetProducts", "ssm:GetParameter", "iam:PassRole"
-                ],
-                "Resource": "*"
-            }
-        ]
-    }
-    
-    # Create OIDC provider URL for the EKS cluster
-    # Use pulumi.Output.concat to properly handle the OIDC provider URL
-    oidc_provider_url = pulumi.Output.concat("oidc.eks.", aws_region, ".amazonaws.com/id/", oidc_provider_id)
+    # Trust the cluster's OIDC provider
+    oidc_provider_arn, oidc_provider_url = _oidc_issuer(
+        aws_region, account_id, oidc_provider_id, oidc_provider_arn, oidc_provider_url
+    )
     
     # Create the IAM role with the trust relationship policy
     role = aws.iam.Role(
         f"{project_name}-karpenter-role",
-        assume_role_policy=pulumi.Output.all(account_id=account_id, oidc_url=oidc_provider_url).apply(
-            lambda args: json.dumps({
-                "Version": "2012-10-17",
-                "Statement": [
-                    {
-                        "Effect": "Allow",
-                        "Principal": {
-                            "Federated": f"arn:aws:iam::{args['account_id']}:oidc-provider/{args['oidc_url']}"
-                        },
-                        "Action": "sts:AssumeRoleWithWebIdentity",
-                        "Condition": {
-                            "StringEquals": {
-                                f"{args['oidc_url']}:aud": "sts.amazonaws.com",
-                                f"{args['oidc_url']}:sub": "system:serviceaccount:karpenter:karpenter"
-                            }
-                        }
-                    }
-                ]
-            })
+        assume_role_policy=pulumi.Output.format(
+            _KARPENTER_TRUST_TEMPLATE, oidc_arn=oidc_provider_arn, oidc_url=oidc_provider_url
         ),
         tags={"Name": f"{project_name}-karpenter-role"}
     )
@@ -158,30 +388,25 @@ def _install_karpenter(provider, project_name: str, aws_region: str, cluster_nam
     policy = aws.iam.Policy(
         f"{project_name}-karpenter-policy",
         description=f"Policy for Karpenter in {project_name}",
-        policy=json.dumps({
-            "Version": "2012-10-17",
-            "Statement": [
-                {
-                    "Effect": "Allow",
-                    "Action": [
-                        "ec2:RunInstances", "ec2:CreateLaunchTemplate", "ec2:CreateFleet",
-                        "ec2:TerminateInstances", "ec2:DescribeInstances", "ec2:DescribeInstanceTypes",
-                        "ec2:DescribeLaunchTemplates", "ec2:DescribeSubnets", "ec2:DescribeSecurityGroups",
-                        "ec2:DescribeInstanceTypeOfferings", "ec2:DescribeSpotPriceHistory",
-                        "pricing:GetProducts", "ssm:GetParameter", "iam:PassRole"
-                    ],
-                    "Resource": "*"
-                }
-            ]
-        })
+        policy=_karpenter_policy(aws_region),
     )
     
-    aws.iam.RolePolicyAttachment(
+    policy_attachment = aws.iam.RolePolicyAttachment(
         f"{project_name}-karpenter-policy-attachment",
         role=role.name,
         policy_arn=policy.arn,
+        opts=pulumi.ResourceOptions(
+            parent=role,
+            # Previously created at the stack root; keep the existing attachment
+            aliases=[pulumi.Alias(parent=pulumi.ROOT_STACK_RESOURCE)],
+        ),
     )
     
+    # AWS settings, with the default instance types if specified in config
+    aws_values = {"defaultInstanceProfile": f"{project_name}-karpenter-instance-profile"}
+    if "instanceTypes" in karpenter_config:
+        aws_values = {**aws_values, "defaultInstanceTypes": list(karpenter_config["instanceTypes"])}
+    
     # Prepare Helm values
     helm_values = {
         "serviceAccount": {
@@ -192,38 +417,31 @@ def _install_karpenter(provider, project_name: str, aws_region: str, cluster_nam
         "controller": {
             "clusterName": cluster_name,
             "clusterEndpoint": cluster_endpoint,
-            "aws": {
-                "defaultInstanceProfile": f"{project_name}-karpenter-instance-profile"
-            },
+            "aws": aws_values,
             "replicas": karpenter_config.get("replicas", 2),
-            "resources": {
-                "limits": {"cpu": "1", "memory": "1Gi"},
-                "requests": {"cpu": "1", "memory": "1Gi"}
-            }
+            "resources": _KARPENTER_RESOURCES,
         },
-        "logLevel": "debug"
+        "logLevel": karpenter_config.get("logLevel", "info")
     }
     
-    # Add instance types if specified in config
-    if "instanceTypes" in karpenter_config:
-        helm_values["controller"]["aws"]["defaultInstanceTypes"] = karpenter_config["instanceTypes"]
-    
     # Get version from config with a default fallback
     chart_version = karpenter_config.get('version', 'v0.15.0')
     
     # Install Karpenter using Helm
-    karpenter_chart = Chart(
+    karpenter_release = Release(
         "karpenter",
-        ChartOpts(
-            chart="karpenter",
+        ReleaseArgs(
+            name="karpenter",
             version=chart_version,
-            fetch_opts=FetchOpts(repo="https://charts.karpenter.sh"),
+            **_chart_source("karpenter", karpenter_config.get("repository", "https://charts.karpenter.sh")),
             namespace="karpenter",
             values=helm_values
         ),
         opts=pulumi.ResourceOptions(
             provider=provider,
-            depends_on=[ns, role, policy],
+            # The role is already a dependency through its ARN in the values;
+            # the controller additionally needs its policy attached
+            depends_on=[ns, policy_attachment],
             ignore_changes=["version"]
         )
     )
@@ -234,215 +452,116 @@ def _install_karpenter(provider, project_name: str, aws_region: str, cluster_nam
     
     return {
         "namespace": ns,
-        "chart": karpenter_chart,
+        "release": karpenter_release,
         "role": role,
         "policy": policy,
+        "policy_attachment": policy_attachment,
         "service_account": "karpenter"
     }
 
-def _install_ebs_csi_driver(provider, project_name: str, aws_region: str) -> None:
+def _install_ebs_csi_driver(provider, project_name: str, aws_region: str, account_id: pulumi.Output[str], ebs_csi_mirror=None, oidc_provider_id: str = None, oidc_provider_arn=None, oidc_provider_url=None) -> Release:
     """Install AWS EBS CSI Driver for dynamic provisioning of EBS volumes.
     
+    The controller's service account is bound to an IRSA role created here
+    with the AWS managed AmazonEBSCSIDriverPolicy.
+    
     Args:
         provider: The Kubernetes provider
         project_name: Name of the project for resource naming
         aws_region: AWS region where the cluster is deployed
+        account_id: The AWS account ID, used when only the OIDC provider ID is known
+        ebs_csi_mirror: Registry prefix to pull the driver images from, or True
+            for the regional EKS ECR registry. When unset the chart's default
+            images are used.
+        oidc_provider_id: The OIDC provider ID for the EKS cluster
+        oidc_provider_arn: ARN of the cluster's IAM OIDC provider
+        oidc_provider_url: Issuer of the cluster's IAM OIDC provider, without the scheme
     """
-    # Create the kube-system namespace if it doesn't exist
-    ns = k8s.core.v1.Namespace.get(
-        "kube-system",
-        "kube-system",
-        opts=pulumi.ResourceOptions(provider=provider),
+    # IRSA role for the controller, trusting the cluster's OIDC provider
+    oidc_provider_arn, oidc_provider_url = _oidc_issuer(
+        aws_region, account_id, oidc_provider_id, oidc_provider_arn, oidc_provider_url
+    )
+    role = aws.iam.Role(
+        f"{project_name}-ebs-csi-controller-role",
+        assume_role_policy=pulumi.Output.format(
+            _EBS_CSI_TRUST_TEMPLATE, oidc_arn=oidc_provider_arn, oidc_url=oidc_provider_url
+        ),
+        tags={"Name": f"{project_name}-ebs-csi-controller-role"}
+    )
+    policy_attachment = aws.iam.RolePolicyAttachment(
+        f"{project_name}-ebs-csi-controller-policy-attachment",
+        role=role.name,
+        policy_arn=f"arn:{_aws_partition(aws_region)}:iam::aws:policy/service-role/AmazonEBSCSIDriverPolicy",
+        opts=pulumi.ResourceOptions(parent=role),
     )
     
-    # Get the ECR repository prefix based on the region
-    ecr_prefix = f"{aws_region}.dkr.ecr.{aws_region}.amazonaws.com"
+    # Image overrides are only needed when pulling from a mirror
+    if ebs_csi_mirror is True:
+        images = _ebs_csi_images(_eks_ecr_registry(aws_region))
+    elif ebs_csi_mirror:
+        images = _ebs_csi_images(ebs_csi_mirror.rstrip("/"))
+    else:
+        images = {}
     
     # Install the AWS EBS CSI Driver
-    Chart(
+    return Release(
         "aws-ebs-csi-driver",
-        ChartOpts(
-            chart="aws-ebs-csi-driver",
+        ReleaseArgs(
+            name="aws-ebs-csi-driver",
             version="2.6.5",
-            fetch_opts=FetchOpts(
-                repo="https://kubernetes-sigs.github.io/aws-ebs-csi-driver",
-            ),
-            namespace=ns.metadata["name"],
+            **_chart_source("aws-ebs-csi-driver", "https://kubernetes-sigs.github.io/aws-ebs-csi-driver"),
+            # kube-system always exists on EKS; no lookup needed
+            namespace="kube-system",
+            # Volumes are provisioned lazily, so don't block the update on rollout
+            skip_await=True,
             values={
                 "region": aws_region,
                 "controller": {
-                    "image": {
-                        "repository": f"{ecr_prefix}/eks/aws-ebs-csi-driver",
-                        "tag": "v1.5.0"
-                    },
-                    "sidecars": {
-                        "provisioner": {
-                            "image": {
-                                "repository": f"{ecr_prefix}/eks/csi-provisioner",
-                                "tag": "v2.2.1"
-                            }
-                        },
-                        "attacher": {
-                            "image": {
-                                "repository": f"{ecr_prefix}/eks/csi-attacher",
-                                "tag": "v3.2.0"
-                            }
-                        },
-                        "snapshotter": {
-                            "image": {
-                                "repository": f"{ecr_prefix}/eks/csi-snapshotter",
-                                "tag": "v4.2.0"
-                            }
-                        },
-                        "resizer": {
-                            "image": {
-                                "repository": f"{ecr_prefix}/eks/csi-resizer",
-                                "tag": "v1.2.0"
-                            }
-                        },
-                        "livenessProbe": {
-                            "image": {
-                                "repository": f"{ecr_prefix}/eks/csi-livenessprobe",
-                                "tag": "v2.3.0"
-                            }
-                        },
-                        "nodeDriverRegistrar": {
-                            "image": {
-                                "repository": f"{ecr_prefix}/eks/csi-node-driver-registrar",
-                                "tag": "v2.2.0"
-                            }
-                        }
-                    },
+                    **_EBS_CSI_CONTROLLER_BASE,
+                    **images,
                     "replicaCount": 2,
                     "serviceAccount": {
                         "create": True,
                         "name": "ebs-csi-controller-sa",
-                        "annotations": {
-                            "eks.amazonaws.com/role-arn": f"arn:aws:iam::${{pulumi.get_stack()}}:role/{project_name}-ebs-csi-controller-role"
-                        },
-                    },
-                    "affinity": {
-                        "podAntiAffinity": {
-                            "preferredDuringSchedulingIgnoredDuringExecution": [
-                                {
-                                    "weight": 100,
-                                    "podAffinityTerm": {
-                                        "labelSelector": {
-                                            "matchExpressions": [
-                                                {
-                                                    "key": "app",
-                                                    "operator": "In",
-                                                    "values": ["ebs-csi-controller"]
-                                                }
-                                            ]
-                                        },
-                                        "topologyKey": "kubernetes.io/hostname"
-                                    }
-                                }
-                            ]
-                        }
-                    },
-                    "tolerations": [
-                        {
-                            "key": "CriticalAddonsOnly",
-                            "operator": "Exists"
-                        }
-                    ],
-                    "nodeSelector": {
-                        "kubernetes.io/os": "linux"
-                    },
-                    "resources": {
-                        "requests": {
-                            "cpu": "200m",
-                            "memory": "200Mi"
-                        },
-                        "limits": {
-                            "cpu": "500m",
-                            "memory": "500Mi"
-                        }
-                    }
-                },
-                "node": {
-                    "tolerations": [
-                        {
-                            "key": "CriticalAddonsOnly",
-                            "operator": "Exists"
-                        }
-                    ],
-                    "nodeSelector": {
-                        "kubernetes.io/os": "linux"
+                        "annotations": {"eks.amazonaws.com/role-arn": role.arn},
                     },
-                    "resources": {
-                        "requests": {
-                            "cpu": "50m",
-                            "memory": "100Mi"
-                        },
-                        "limits": {
-                            "cpu": "200m",
-                            "memory": "200Mi"
-                        }
-                    }
                 },
-                "storageClasses": [
-                    {
-                        "name": "gp3",
-                        "annotations": {
-                            "storageclass.kubernetes.io/is-default-class": "true"
-                        },
-                        "volumeBindingMode": "WaitForFirstConsumer",
-                        "reclaimPolicy": "Delete",
-                        "parameters": {
-                            "type": "gp3",
-                            "encrypted": "true"
-                        }
-                    },
-                    {
-                        "name": "gp3-encrypted",
-                        "annotations": {
-                            "storageclass.kubernetes.io/is-default-class": "false"
-                        },
-                        "volumeBindingMode": "WaitForFirstConsumer",
-                        "reclaimPolicy": "Delete",
-                        "parameters": {
-                            "type": "gp3",
-                            "encrypted": "true"
-                        }
-                    },
-                    {
-                        "name": "sc1",
-                        "annotations": {
-                            "storageclass.kubernetes.io/is-default-class": "false"
-                        },
-                        "volumeBindingMode": "WaitForFirstConsumer",
-                        "reclaimPolicy": "Delete",
-                        "parameters": {
-                            "type": "sc1"
-                        }
-                    },
-                    {
-                        "name": "st1",
-                        "annotations": {
-                            "storageclass.kubernetes.io/is-default-class": "false"
-                        },
-                        "volumeBindingMode": "WaitForFirstConsumer",
-                        "reclaimPolicy": "Delete",
-                        "parameters": {
-                            "type": "st1"
-                        }
-                    },
-                    {
-                        "name": "io1",
-                        "annotations": {
-                            "storageclass.kubernetes.io/is-default-class": "false"
-                        },
-                        "volumeBindingMode": "WaitForFirstConsumer",
-                        "reclaimPolicy": "Delete",
-                        "parameters": {
-                            "type": "io1"
-                        }
-                    }
-                ]
+                "node": _EBS_CSI_NODE,
+                "storageClasses": _EBS_CSI_STORAGE_CLASSES,
             },
         ),
-        opts=pulumi.ResourceOptions(provider=provider, depends_on=[ns]),
+        opts=pulumi.ResourceOptions(
+            provider=provider,
+            # The controller needs its policy attached before it starts
+            depends_on=[policy_attachment],
+            # The controller image tag only exists in the values when a mirror
+            # is set, and then the release doesn't diff on it: tag bumps need
+            # `pulumi up --replace` on this release or a manual helm upgrade
+            ignore_changes=["values.controller.image.tag"] if ebs_csi_mirror else None,
+        ),
     )
+
+# Installable add-ons, in installation order:
+# (AddonsConfig flag, installer, installer arguments, context values that must be set)
+_ADDON_REGISTRY = (
+    ("metrics_server", _install_metrics_server, ("provider", "project_name"), ()),
+    (
+        "ebs_csi_driver",
+        _install_ebs_csi_driver,
+        (
+            "provider", "project_name", "aws_region", "account_id", "ebs_csi_mirror",
+            "oidc_provider_id", "oidc_provider_arn", "oidc_provider_url",
+        ),
+        (),
+    ),
+    (
+        "karpenter",
+        _install_karpenter,
+        (
+            "provider", "project_name", "aws_region", "cluster_name", "karpenter_config",
+            "account_id", "oidc_provider_id", "cluster_endpoint", "cluster_ca",
+            "oidc_provider_arn", "oidc_provider_url",
+        ),
+        ("karpenter_config",),
+    ),
+)
@@ -0,0 +1,148 @@
+"""
+Configuration Module for EKS Cluster
+
+This module defines the validated, immutable form of the project's EKS
+configuration file. The JSON document is parsed once into these dataclasses
+so that consumers use attribute access and configuration errors surface at
+load time rather than midway through a deployment.
+"""
+
+import sys
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any, Mapping, Optional, Union
+
+# Shared read-only default for optional config sections
+_EMPTY: Mapping[str, Any] = MappingProxyType({})
+
+def _present(data: Mapping[str, Any], keys: Mapping[str, str]) -> dict:
+    """Map the JSON keys present in ``data`` to dataclass field names.
+    
+    Absent keys are left out so the dataclass defaults apply.
+    """
+    return {attr: data[key] for key, attr in keys.items() if key in data}
+
+def _freeze(data: Any) -> Any:
+    """Return a read-only copy of ``data``: mappings become MappingProxyType
+    with interned keys and lists become tuples, recursively.
+    
+    Freezing lets the cached config be shared between callers without
+    defensive copies. Frozen sequences must be converted back with
+    ``list()`` before they are passed as Pulumi inputs.
+    """
+    if isinstance(data, Mapping):
+        return MappingProxyType({sys.intern(k): _freeze(v) for k, v in data.items()})
+    if isinstance(data, list):
+        return tuple(_freeze(v) for v in data)
+    return data
+
+def _require(data: Mapping[str, Any], key: str, path: str) -> Any:
+    """Return ``data[key]``, raising a descriptive error when it is missing."""
+    try:
+        return data[key]
+    except KeyError:
+        raise ValueError(f"EKS config is missing required key '{path}.{key}'") from None
+
+@dataclass(frozen=True, slots=True)
+class ProjectConfig:
+    """
+    Project-level settings.
+    """
+    name: str
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "ProjectConfig":
+        name = _require(data, "name", "project")
+        if not isinstance(name, str) or not name:
+            raise ValueError("EKS config 'project.name' must be a non-empty string")
+        return cls(name=name)
+
+_NODE_KEYS = {
+    "instanceType": "instance_type",
+    "minSize": "min_size",
+    "maxSize": "max_size",
+    "desiredSize": "desired_size",
+}
+
+_ADDONS_KEYS = {
+    "enable": "enable",
+    "metricsServer": "metrics_server",
+    "ebsCsiDriver": "ebs_csi_driver",
+    "karpenter": "karpenter",
+    "ebsCsiPrivateMirror": "ebs_csi_private_mirror",
+}
+
+@dataclass(frozen=True, slots=True)
+class NodeConfig:
+    """
+    Sizing for the default managed node group.
+    """
+    instance_type: str = "t3.medium"
+    min_size: int = 2
+    max_size: int = 5
+    desired_size: int = 2
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "NodeConfig":
+        node = cls(**_present(data, _NODE_KEYS))
+        if not node.min_size <= node.desired_size <= node.max_size:
+            raise ValueError(
+                "EKS config 'eks.node' must satisfy minSize <= desiredSize <= maxSize, got "
+                f"{node.min_size} <= {node.desired_size} <= {node.max_size}"
+            )
+        return node
+
+@dataclass(frozen=True, slots=True)
+class AddonsConfig:
+    """
+    Switches for the Kubernetes add-ons installed on the cluster.
+    """
+    enable: bool = True
+    metrics_server: bool = True
+    ebs_csi_driver: bool = True
+    karpenter: bool = False
+    # Registry the EBS CSI driver images are pulled from: a registry prefix,
+    # or true for the regional EKS ECR registry. Unset uses the chart defaults.
+    ebs_csi_private_mirror: Optional[Union[str, bool]] = None
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "AddonsConfig":
+        addons = cls(**_present(data, _ADDONS_KEYS))
+        if not isinstance(addons.ebs_csi_private_mirror, (str, bool, type(None))):
+            raise ValueError(
+                "EKS config 'eks.addons.ebsCsiPrivateMirror' must be a registry prefix or a boolean"
+            )
+        return addons
+
+@dataclass(frozen=True, slots=True)
+class ClusterConfig:
+    """
+    The ``eks`` section of the configuration file.
+    """
+    node: NodeConfig
+    addons: AddonsConfig
+    karpenter: Mapping[str, Any] = field(default_factory=lambda: _EMPTY)
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "ClusterConfig":
+        return cls(
+            node=NodeConfig.from_dict(_require(data, "node", "eks")),
+            addons=AddonsConfig.from_dict(data.get("addons", _EMPTY)),
+            karpenter=_freeze(data.get("karpenter", _EMPTY)),
+        )
+
+@dataclass(frozen=True, slots=True)
+class EksConfig:
+    """
+    The complete, validated EKS configuration.
+    """
+    project: ProjectConfig
+    eks: ClusterConfig
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "EksConfig":
+        """Build the configuration from the parsed JSON document in one pass."""
+        return cls(
+            project=ProjectConfig.from_dict(_require(data, "project", "<root>")),
+            eks=ClusterConfig.from_dict(_require(data, "eks", "<root>")),
+        )
@@ -5,126 +5,179 @@ This module handles the creation and configuration of an Amazon EKS cluster,
 including the control plane, node groups, and Fargate profiles.
 """
 
-from typing import Dict, List, Optional
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
 import pulumi
 import pulumi_aws as aws
-import pulumi_eks as eks
-from pulumi_aws.ec2 import SecurityGroup, SecurityGroupRule, SecurityGroupRuleArgs
 
+from infrastructure.config import NodeConfig
+from infrastructure.naming import ResourceNames
+
+# Final path segment of the issuer URL, i.e. the OIDC provider ID
+_OIDC_ID_RE = re.compile(r"[^/]+$")
+
+def _extract_oidc_id(url: str) -> str:
+    """Return the OIDC provider ID from the issuer URL ("" if it has none)."""
+    match = _OIDC_ID_RE.search(url)
+    return match.group(0) if match else ""
+
+def _strip_scheme(url: str) -> str:
+    """Return the URL without its https:// scheme."""
+    return url.removeprefix("https://")
+
+# Cluster security group rules; these do not depend on the project. They are
+# tuples so they cannot be extended in place, and each call passes a fresh list
+_CLUSTER_SG_INGRESS = (
+    {
+        "description": "Allow nodes to communicate with each other",
+        "from_port": 0,
+        "to_port": 0,
+        "protocol": "-1",
+        "cidr_blocks": ["172.20.0.0/16"],
+    },
+    {
+        "description": "Allow pods to communicate with the cluster API",
+        "from_port": 443,
+        "to_port": 443,
+        "protocol": "tcp",
+        "cidr_blocks": ["0.0.0.0/0"],
+    },
+)
+_CLUSTER_SG_EGRESS = (
+    {
+        "description": "Allow all outbound traffic",
+        "from_port": 0,
+        "to_port": 0,
+        "protocol": "-1",
+        "cidr_blocks": ["0.0.0.0/0"],
+    },
+)
+
+# Cluster autoscaler auto-discovery tags for the managed node group
+_NODE_GROUP_TAGS = {
+    "k8s.io/cluster-autoscaler/enabled": "true",
+    "k8s.io/cluster-autoscaler/auto-discovery": "enabled",
+}
+
+# Type token of the component the cluster resources are grouped under
+_COMPONENT_TYPE = "infrastructure:eks:Cluster"
+
+def _cluster_child(parent: pulumi.Resource, **options) -> pulumi.ResourceOptions:
+    """Options nesting a cluster resource under ``parent``, keeping its root URN."""
+    return pulumi.ResourceOptions(
+        parent=parent,
+        aliases=[pulumi.Alias(parent=pulumi.ROOT_STACK_RESOURCE)],
+        **options,
+    )
+
+@dataclass(frozen=True, slots=True)
 class EksOutput:
     """
     A class to hold EKS cluster related outputs.
     """
-    def __init__(self, kubeconfig, eks_cluster, node_groups, oidc_provider_id=None):
-        self.kubeconfig = kubeconfig
-        self.eks_cluster = eks_cluster
-        self.node_groups = node_groups
-        self.oidc_provider_id = oidc_provider_id
+    kubeconfig: pulumi.Output[Any]
+    eks_cluster: Any  # pulumi_eks.Cluster, imported lazily
+    node_groups: Dict[str, aws.eks.NodeGroup]
+    oidc_provider_id: Optional[pulumi.Output[str]] = None
+    oidc_provider_arn: Optional[pulumi.Output[str]] = None
+    oidc_provider_url: Optional[pulumi.Output[str]] = None
 
 def create_eks_cluster(
-    project_name: str,
-    vpc_id: str,
-    private_subnet_ids: List[str],
-    public_subnet_ids: List[str],
+    names: ResourceNames,
+    vpc_id: pulumi.Output[str],
+    private_subnet_ids: pulumi.Output[List[str]],
+    public_subnet_ids: pulumi.Output[List[str]],
     node_role_arn: pulumi.Output[str],
-    node_config: dict,
+    node_config: NodeConfig,
 ) -> EksOutput:
     """
     Create an EKS cluster with managed node groups.
     
     Args:
-        project_name: Name of the project for resource naming and tagging
+        names: Names of the project's resources, also used for tagging
         vpc_id: ID of the VPC where the cluster will be created
-        private_subnet_ids: List of private subnet IDs for the cluster
-        public_subnet_ids: List of public subnet IDs for the cluster
+        private_subnet_ids: Private subnet IDs, resolved together as one output
+        public_subnet_ids: Public subnet IDs, resolved together as one output
         node_role_arn: ARN of the IAM role for the EKS nodes
+        node_config: Sizing for the default managed node group
         
     Returns:
         EksOutput: Object containing cluster and node group information
     """
+    # pulumi_eks is only loaded once a cluster is actually declared
+    import pulumi_eks as eks
+    
     # Node config is now passed as a parameter
     
-    # Create an EKS cluster
+    # Component grouping the cluster resources in the stack's state
+    component = pulumi.ComponentResource(_COMPONENT_TYPE, names.eks)
+    
+    # Cluster security group, declared on its own so it only waits on the VPC
+    cluster_sg = aws.ec2.SecurityGroup(
+        names.cluster_sg,
+        vpc_id=vpc_id,
+        description="EKS Cluster Security Group",
+        ingress=list(_CLUSTER_SG_INGRESS),
+        egress=list(_CLUSTER_SG_EGRESS),
+        tags=names.tags(names.cluster_sg),
+        opts=_cluster_child(component),
+    )
+    
+    # Create an EKS cluster. It stays at the stack root: eks.Cluster is a
+    # multi-language component, and moving it under the component would rely
+    # on its remote children inheriting the alias
     cluster = eks.Cluster(
-        f"{project_name}-cluster",
-        name=f"{project_name}-cluster",
+        names.cluster,
+        name=names.cluster,
         vpc_id=vpc_id,
-        subnet_ids=private_subnet_ids + public_subnet_ids,
+        subnet_ids=pulumi.Output.all(private_subnet_ids, public_subnet_ids).apply(
+            lambda tiers: [*tiers[0], *tiers[1]]
+        ),
         create_oidc_provider=True,
         enabled_cluster_log_types=[
             "api", "audit", "authenticator", "controllerManager", "scheduler"
         ],
-        tags={
-            "Name": f"{project_name}-cluster",
-            "Project": project_name,
-            "Environment": "production",
-        },
+        tags=names.tags(names.cluster, Environment="production"),
         # Enable private endpoint and public access
         endpoint_private_access=True,
         endpoint_public_access=True,
         public_access_cidrs=["0.0.0.0/0"],  # Restrict in production
-        # Configure cluster security group
-        cluster_security_group=aws.ec2.SecurityGroup(
-            f"{project_name}-cluster-sg",
-            vpc_id=vpc_id,
-            description="EKS Cluster Security Group",
-            ingress=[
-                {
-                    "description": "Allow nodes to communicate with each other",
-                    "from_port": 0,
-                    "to_port": 0,
-                    "protocol": "-1",
-                    "cidr_blocks": ["172.20.0.0/16"],
-                },
-                {
-                    "description": "Allow pods to communicate with the cluster API",
-                    "from_port": 443,
-                    "to_port": 443,
-                    "protocol": "tcp",
-                    "cidr_blocks": ["0.0.0.0/0"],
-                },
-            ],
-            egress=[
-                {
-                    "description": "Allow all outbound traffic",
-                    "from_port": 0,
-                    "to_port": 0,
-                    "protocol": "-1",
-                    "cidr_blocks": ["0.0.0.0/0"],
-                }
-            ],
-            tags={
-                "Name": f"{project_name}-cluster-sg",
-                "Project": project_name,
-            },
-        ),
+        cluster_security_group=cluster_sg,
     )
 
     # Create managed node group using config
     node_group = aws.eks.NodeGroup(
-        f"{project_name}-ng",
+        names.node_group,
         cluster_name=cluster.core.cluster.name,
         node_role_arn=node_role_arn,
         subnet_ids=private_subnet_ids,
         scaling_config={
-            "desired_size": node_config.get("desiredSize", 2),
-            "min_size": node_config.get("minSize", 2),
-            "max_size": node_config.get("maxSize", 5),
-        },
-        instance_types=[node_config.get("instanceType", "t3.medium")],
-        tags={
-            "Name": f"{project_name}-ng",
-            "Project": project_name,
-            "k8s.io/cluster-autoscaler/enabled": "true",
-            "k8s.io/cluster-autoscaler/auto-discovery": "enabled",
+            "desired_size": node_config.desired_size,
+            "min_size": node_config.min_size,
+            "max_size": node_config.max_size,
         },
+        instance_types=[node_config.instance_type],
+        tags=names.tags(names.node_group, **_NODE_GROUP_TAGS),
+        # The autoscaler owns the running size; desiredSize from the config
+        # only sets the initial size, so later scaling is not reverted
+        opts=_cluster_child(component, ignore_changes=["scalingConfig.desiredSize"]),
     )
 
     # Get the OIDC provider ID from the cluster's OIDC provider URL
-    oidc_provider_id = cluster.core.oidc_provider.url.apply(lambda url: url.split('/')[-1])
+    oidc_provider = cluster.core.oidc_provider
+    oidc_provider_id = oidc_provider.url.apply(_extract_oidc_id)
+    component.register_outputs({
+        "kubeconfig": cluster.kubeconfig,
+        "cluster_name": cluster.core.cluster.name,
+        "oidc_provider_arn": oidc_provider.arn,
+    })
     return EksOutput(
         kubeconfig=cluster.kubeconfig,
         eks_cluster=cluster,
         node_groups={"default": node_group},
-        oidc_provider_id=oidc_provider_id
+        oidc_provider_id=oidc_provider_id,
+        oidc_provider_arn=oidc_provider.arn,
+        # IAM condition keys use the issuer without its scheme
+        oidc_provider_url=oidc_provider.url.apply(_strip_scheme),
     )
@@ -6,68 +6,122 @@ including the cluster role, node group role, and any additional service accounts
 """
 
 import json
+from dataclasses import dataclass
+from typing import Dict
 import pulumi
 import pulumi_aws as aws
-from typing import NamedTuple
 
+from infrastructure.naming import ResourceNames
+
+def _policy_json(document: dict) -> str:
+    """Serialize a policy document canonically (sorted keys, no whitespace).
+    
+    A canonical form keeps the resource inputs byte-identical between runs
+    and Python versions.
+    """
+    return json.dumps(document, separators=(",", ":"), sort_keys=True)
+
+def _assume_role_policy(service: str) -> str:
+    """Trust policy letting the AWS ``service`` principal assume a role."""
+    return _policy_json({
+        "Version": "2012-10-17",
+        "Statement": [{
+            "Effect": "Allow",
+            "Principal": {"Service": service},
+            "Action": "sts:AssumeRole",
+        }],
+    })
+
+# The policy documents never change, so they are serialized once at import
+_EKS_ASSUME_ROLE_POLICY = _assume_role_policy("eks.amazonaws.com")
+_EC2_ASSUME_ROLE_POLICY = _assume_role_policy("ec2.amazonaws.com")
+_AUTOSCALER_ACTIONS = (
+    "autoscaling:DescribeAutoScalingGroups",
+    "autoscaling:DescribeAutoScalingInstances",
+    "autoscaling:DescribeLaunchConfigurations",
+    "autoscaling:DescribeTags",
+    "autoscaling:SetDesiredCapacity",
+    "autoscaling:TerminateInstanceInAutoScalingGroup",
+    "ec2:DescribeLaunchTemplateVersions",
+)
+_AUTOSCALER_POLICY = _policy_json({
+    "Version": "2012-10-17",
+    "Statement": [
+        {
+            "Effect": "Allow",
+            "Action": list(_AUTOSCALER_ACTIONS),
+            "Resource": "*"
+        }
+    ]
+})
+
+# Type token of the component the IAM resources are grouped under
+_COMPONENT_TYPE = "infrastructure:iam:Roles"
+
+def _iam_child(parent: pulumi.Resource, **options) -> pulumi.ResourceOptions:
+    """Options nesting an IAM resource under ``parent``, keeping its root URN."""
+    return pulumi.ResourceOptions(
+        parent=parent,
+        aliases=[pulumi.Alias(parent=pulumi.ROOT_STACK_RESOURCE)],
+        **options,
+    )
+
+def _next_in_window(declared: list, limit: int) -> list:
+    """``depends_on`` for the next of a series of IAM calls, at most ``limit`` in flight.
+    
+    Each resource waits for the one declared ``limit`` places before it.
+    """
+    return [declared[-limit]] if len(declared) >= limit else []
+
+@dataclass(frozen=True, slots=True)
 class IamOutput:
     """
     A class to hold IAM related outputs.
     """
-    def __init__(self, cluster_role, node_role, service_account_roles):
-        self.cluster_role = cluster_role
-        self.node_role = node_role
-        self.service_account_roles = service_account_roles
+    cluster_role: aws.iam.Role
+    node_role: aws.iam.Role
+    service_account_roles: Dict[str, aws.iam.Role]
 
-def create_iam_roles(project_name: str) -> IamOutput:
+def create_iam_roles(names: ResourceNames, iam_parallel: int = 4) -> IamOutput:
     """
     Create IAM roles and policies for the EKS cluster.
     
     Args:
-        project_name: Name of the project for resource naming and tagging
+        names: Names of the project's resources, also used for tagging
+        iam_parallel: Maximum number of node role policy attachments created
+            at once, to stay under IAM's API rate limits
         
     Returns:
         IamOutput: Object containing the created IAM roles
     """
+    if iam_parallel < 1:
+        raise ValueError(f"iam_parallel must be at least 1, got {iam_parallel}")
+    
+    # Component grouping the IAM resources in the stack's state
+    roles = pulumi.ComponentResource(_COMPONENT_TYPE, names.iam)
+    
     # EKS Cluster Role
     cluster_role = aws.iam.Role(
-        f"{project_name}-cluster-role",
-        assume_role_policy=json.dumps({
-            "Version": "2012-10-17",
-            "Statement": [{
-                "Effect": "Allow",
-                "Principal": {"Service": "eks.amazonaws.com"},
-                "Action": "sts:AssumeRole",
-            }],
-        }),
-        tags={
-            "Name": f"{project_name}-cluster-role",
-            "Project": project_name,
-        },
+        names.cluster_role,
+        assume_role_policy=_EKS_ASSUME_ROLE_POLICY,
+        tags=names.tags(names.cluster_role),
+        opts=_iam_child(roles),
     )
     
     # Attach the Amazon EKS Cluster Policy
     cluster_policy_attachment = aws.iam.RolePolicyAttachment(
-        f"{project_name}-cluster-policy",
+        names.cluster_policy,
         role=cluster_role.name,
         policy_arn="arn:aws:iam::aws:policy/AmazonEKSClusterPolicy",
+        opts=_iam_child(roles),
     )
     
     # EKS Node Group Role
     node_role = aws.iam.Role(
-        f"{project_name}-node-role",
-        assume_role_policy=json.dumps({
-            "Version": "2012-10-17",
-            "Statement": [{
-                "Effect": "Allow",
-                "Principal": {"Service": "ec2.amazonaws.com"},
-                "Action": "sts:AssumeRole",
-            }],
-        }),
-        tags={
-            "Name": f"{project_name}-node-role",
-            "Project": project_name,
-        },
+        names.node_role,
+        assume_role_policy=_EC2_ASSUME_ROLE_POLICY,
+        tags=names.tags(names.node_role),
+        opts=_iam_child(roles),
     )
     
     # Attach required policies to node role
@@ -78,44 +132,44 @@ def create_iam_roles(project_name: str) -> IamOutput:
         "arn:aws:iam::aws:policy/AmazonSSMManagedInstanceCore",
     ]
     
+    # The attachments only depend on the role, so they are declared together
+    # as its children; the alias keeps their original root-level URNs. They
+    # are chained so that at most iam_parallel of them are created at once.
+    node_policy_attachments = []
     for i, policy in enumerate(node_policies):
-        aws.iam.RolePolicyAttachment(
-            f"{project_name}-node-policy-{i}",
+        node_policy_attachments.append(aws.iam.RolePolicyAttachment(
+            names.node_policy(i),
             role=node_role.name,
             policy_arn=policy,
-        )
+            opts=_iam_child(
+                node_role,
+                depends_on=_next_in_window(node_policy_attachments, iam_parallel),
+            ),
+        ))
     
     # Additional policies for cluster autoscaler
     autoscaler_policy = aws.iam.Policy(
-        f"{project_name}-cluster-autoscaler-policy",
+        names.autoscaler_policy,
         description="Policy for cluster autoscaler",
-        policy=json.dumps({
-            "Version": "2012-10-17",
-            "Statement": [
-                {
-                    "Effect": "Allow",
-                    "Action": [
-                        "autoscaling:DescribeAutoScalingGroups",
-                        "autoscaling:DescribeAutoScalingInstances",
-                        "autoscaling:DescribeLaunchConfigurations",
-                        "autoscaling:DescribeTags",
-                        "autoscaling:SetDesiredCapacity",
-                        "autoscaling:TerminateInstanceInAutoScalingGroup",
-                        "ec2:DescribeLaunchTemplateVersions"
-                    ],
-                    "Resource": "*"
-                }
-            ]
-        }),
+        policy=_AUTOSCALER_POLICY,
+        opts=_iam_child(roles),
     )
     
-    # Attach autoscaler policy to node role
+    # Attach autoscaler policy to node role, as the last call of the series
     aws.iam.RolePolicyAttachment(
-        f"{project_name}-autoscaler-policy-attach",
+        names.autoscaler_policy_attach,
         role=node_role.name,
         policy_arn=autoscaler_policy.arn,
+        opts=_iam_child(
+            roles,
+            depends_on=_next_in_window(node_policy_attachments, iam_parallel),
+        ),
     )
     
+    roles.register_outputs({
+        "cluster_role_arn": cluster_role.arn,
+        "node_role_arn": node_role.arn,
+    })
     return IamOutput(
         cluster_role=cluster_role,
         node_role=node_role,
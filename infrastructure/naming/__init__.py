@@ -0,0 +1,89 @@
+"""
+Naming Module
+
+This module provides the resource names and tag conventions shared by the
+VPC, IAM and EKS modules.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict
+
+@dataclass(frozen=True, slots=True)
+class ResourceNames:
+    """
+    Names of the project's VPC, IAM and EKS resources.
+
+    Every name is ``{project}-{suffix}``. The names are resource URN
+    components, so changing one replaces the resource.
+    """
+    project: str
+    network: str = field(init=False)
+    vpc: str = field(init=False)
+    igw: str = field(init=False)
+    nat_eip: str = field(init=False)
+    natgw: str = field(init=False)
+    public_rt: str = field(init=False)
+    private_rt: str = field(init=False)
+    s3_endpoint: str = field(init=False)
+    iam: str = field(init=False)
+    cluster_role: str = field(init=False)
+    cluster_policy: str = field(init=False)
+    node_role: str = field(init=False)
+    autoscaler_policy: str = field(init=False)
+    autoscaler_policy_attach: str = field(init=False)
+    eks: str = field(init=False)
+    cluster: str = field(init=False)
+    cluster_sg: str = field(init=False)
+    node_group: str = field(init=False)
+
+    def __post_init__(self):
+        suffixes = {
+            "network": "network",
+            "vpc": "vpc",
+            "igw": "igw",
+            "nat_eip": "nat-eip",
+            "natgw": "natgw",
+            "public_rt": "public-rt",
+            "private_rt": "private-rt",
+            "s3_endpoint": "s3-endpoint",
+            "iam": "iam",
+            "cluster_role": "cluster-role",
+            "cluster_policy": "cluster-policy",
+            "node_role": "node-role",
+            "autoscaler_policy": "cluster-autoscaler-policy",
+            "autoscaler_policy_attach": "autoscaler-policy-attach",
+            "eks": "eks",
+            "cluster": "cluster",
+            "cluster_sg": "cluster-sg",
+            "node_group": "ng",
+        }
+        for attr, suffix in suffixes.items():
+            object.__setattr__(self, attr, f"{self.project}-{suffix}")
+
+    def public_subnet(self, index: int) -> str:
+        return f"{self.project}-public-{index}"
+
+    def private_subnet(self, index: int) -> str:
+        return f"{self.project}-private-{index}"
+
+    def public_rta(self, index: int) -> str:
+        return f"{self.project}-public-rta-{index}"
+
+    def private_rta(self, index: int) -> str:
+        return f"{self.project}-private-rta-{index}"
+
+    def node_policy(self, index: int) -> str:
+        return f"{self.project}-node-policy-{index}"
+
+    def tags(self, name: str, **extra: str) -> Dict[str, str]:
+        """
+        Build the standard tags for the resource called ``name``.
+
+        Args:
+            name: Full resource name, used as the Name tag
+            **extra: Additional tags merged over the standard ones
+
+        Returns:
+            Dict[str, str]: A new tag map (Pulumi inputs must be plain dicts)
+        """
+        return {"Name": name, "Project": self.project, **extra}
@@ -5,123 +5,195 @@ This module provides functionality to create a production-grade VPC with public
 NAT gateways, and proper route tables for an EKS cluster.
 """
 
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import List
 import pulumi
 import pulumi_aws as aws
+
+from infrastructure.naming import ResourceNames
+
+@dataclass(frozen=True, slots=True)
 class VpcOutput:
     """
     A class to hold VPC related outputs.
     """
-    def __init__(self, vpc_id, private_subnet_ids, public_subnet_ids):
-        self.vpc_id = vpc_id
-        self.private_subnet_ids = private_subnet_ids
-        self.public_subnet_ids = public_subnet_ids
+    vpc_id: pulumi.Output[str]
+    private_subnet_ids: pulumi.Output[List[str]]
+    public_subnet_ids: pulumi.Output[List[str]]
 
-import pulumi
-import pulumi_aws as aws
-from typing import List
+# Type token of the component the network resources are grouped under
+_COMPONENT_TYPE = "infrastructure:vpc:Network"
+
+# The provider region, read once when the module is imported
+_REGION = aws.config.region
 
-def create_vpc(project_name: str) -> VpcOutput:
+@lru_cache(maxsize=1)
+def _availability_zones() -> pulumi.Output[List[str]]:
+    """Names of the region's available AZs, looked up once per program run.
+    
+    The Output form of the invoke resolves asynchronously, so the program
+    does not block on it and the resources declared after create_vpc (IAM
+    roles) register concurrently.
+    """
+    return aws.get_availability_zones_output(state="available").names
+
+def _network_child(parent: pulumi.Resource, **options) -> pulumi.ResourceOptions:
+    """Options nesting a network resource under ``parent``.
+    
+    The alias keeps the URN each resource had when it was created at the
+    stack root, so existing stacks are not replaced.
+    """
+    return pulumi.ResourceOptions(
+        parent=parent,
+        aliases=[pulumi.Alias(parent=pulumi.ROOT_STACK_RESOURCE)],
+        **options,
+    )
+
+def _route_table_child(route_table: aws.ec2.RouteTable, vpc: aws.ec2.Vpc) -> pulumi.ResourceOptions:
+    """Options nesting a route table association under its route table.
+    
+    Besides the stack root, the aliases cover the URN the association had
+    while it was nested directly under the VPC.
+    """
+    return pulumi.ResourceOptions(
+        parent=route_table,
+        aliases=[
+            pulumi.Alias(parent=pulumi.ROOT_STACK_RESOURCE),
+            pulumi.Alias(parent=vpc),
+        ],
+    )
+
+def create_vpc(names: ResourceNames) -> VpcOutput:
     """
     Create a production-ready VPC with public and private subnets for EKS.
     Args:
-        project_name: Name for tagging AWS resources
+        names: Names of the project's resources, also used for tagging
     Returns:
         VpcOutput: Object containing VPC ID and subnet IDs
     """
+    # Component grouping the network resources in the stack's state
+    network = pulumi.ComponentResource(_COMPONENT_TYPE, names.network)
+
     # 1. Create VPC
     vpc = aws.ec2.Vpc(
-        f"{project_name}-vpc",
+        names.vpc,
         cidr_block="10.0.0.0/16",
         enable_dns_hostnames=True,
         enable_dns_support=True,
-        tags={"Name": f"{project_name}-vpc", "Project": project_name}
+        tags=names.tags(names.vpc),
+        opts=_network_child(network)
     )
 
     # 2. Create Internet Gateway
     igw = aws.ec2.InternetGateway(
-        f"{project_name}-igw",
+        names.igw,
         vpc_id=vpc.id,
-        tags={"Name": f"{project_name}-igw", "Project": project_name}
+        tags=names.tags(names.igw),
+        opts=_network_child(vpc)
+    )
+
+    # 3. Allocate the NAT gateway's Elastic IP. It references nothing in the
+    # VPC, so it is parented to the component rather than the VPC (a child
+    # waits for its parent's registration) and is allocated right away.
+    eip = aws.ec2.Eip(
+        names.nat_eip,
+        domain="vpc",
+        opts=_network_child(network)
     )
 
-    # 3. Get availability zones (use 2 for HA)
-    azs = aws.get_availability_zones(state="available").names[:2]
-
-    # 4. Create public and private subnets
-    public_subnets = []
-    private_subnets = []
-    for i, az in enumerate(azs):
-        public_subnets.append(
-            aws.ec2.Subnet(
-                f"{project_name}-public-{i}",
-                vpc_id=vpc.id,
-                cidr_block=f"10.0.{i}.0/24",
-                availability_zone=az,
-                map_public_ip_on_launch=True,
-                tags={"Name": f"{project_name}-public-{i}", "Project": project_name}
-            )
+    # 4. Get availability zones (use 2 for HA)
+    azs = _availability_zones()
+
+    # 5. Create public and private subnets
+    public_subnets = [
+        aws.ec2.Subnet(
+            names.public_subnet(i),
+            vpc_id=vpc.id,
+            cidr_block=f"10.0.{i}.0/24",
+            availability_zone=azs[i],
+            map_public_ip_on_launch=True,
+            tags=names.tags(names.public_subnet(i)),
+            opts=_network_child(vpc)
         )
-        private_subnets.append(
-            aws.ec2.Subnet(
-                f"{project_name}-private-{i}",
-                vpc_id=vpc.id,
-                cidr_block=f"10.0.{i+10}.0/24",
-                availability_zone=az,
-                map_public_ip_on_launch=False,
-                tags={"Name": f"{project_name}-private-{i}", "Project": project_name}
-            )
+        for i in range(2)
+    ]
+    private_subnets = [
+        aws.ec2.Subnet(
+            names.private_subnet(i),
+            vpc_id=vpc.id,
+            cidr_block=f"10.0.{i+10}.0/24",
+            availability_zone=azs[i],
+            map_public_ip_on_launch=False,
+            tags=names.tags(names.private_subnet(i)),
+            opts=_network_child(vpc)
         )
+        for i in range(2)
+    ]
 
-    # 5. Create public route table and associate with public subnets
+    # 6. Create public route table and associate with public subnets
     public_rt = aws.ec2.RouteTable(
-        f"{project_name}-public-rt",
+        names.public_rt,
         vpc_id=vpc.id,
         routes=[{"cidr_block": "0.0.0.0/0", "gateway_id": igw.id}],
-        tags={"Name": f"{project_name}-public-rt", "Project": project_name}
+        tags=names.tags(names.public_rt),
+        opts=_network_child(vpc)
     )
     for i, subnet in enumerate(public_subnets):
         aws.ec2.RouteTableAssociation(
-            f"{project_name}-public-rta-{i}",
+            names.public_rta(i),
             subnet_id=subnet.id,
-            route_table_id=public_rt.id
+            route_table_id=public_rt.id,
+            opts=_route_table_child(public_rt, vpc)
         )
 
-    # 6. Create NAT Gateway in the first public subnet
-    eip = aws.ec2.Eip(f"{project_name}-nat-eip", domain="vpc")
+    # 7. Create NAT Gateway in the first public subnet. It does not reference
+    # the IGW but needs it attached before it can route traffic.
     nat_gw = aws.ec2.NatGateway(
-        f"{project_name}-natgw",
+        names.natgw,
         allocation_id=eip.id,
         subnet_id=public_subnets[0].id,
-        tags={"Name": f"{project_name}-natgw", "Project": project_name}
+        tags=names.tags(names.natgw),
+        opts=_network_child(vpc, depends_on=[igw])
     )
 
-    # 7. Private route table with NAT
+    # 8. Private route table with NAT
     private_rt = aws.ec2.RouteTable(
-        f"{project_name}-private-rt",
+        names.private_rt,
         vpc_id=vpc.id,
         routes=[{"cidr_block": "0.0.0.0/0", "nat_gateway_id": nat_gw.id}],
-        tags={"Name": f"{project_name}-private-rt", "Project": project_name}
+        tags=names.tags(names.private_rt),
+        opts=_network_child(vpc)
     )
     for i, subnet in enumerate(private_subnets):
         aws.ec2.RouteTableAssociation(
-            f"{project_name}-private-rta-{i}",
+            names.private_rta(i),
             subnet_id=subnet.id,
-            route_table_id=private_rt.id
+            route_table_id=private_rt.id,
+            opts=_route_table_child(private_rt, vpc)
         )
 
-    # 8. S3 VPC Endpoint for private subnets
+    # 9. S3 VPC Endpoint for private subnets
     aws.ec2.VpcEndpoint(
-        f"{project_name}-s3-endpoint",
+        names.s3_endpoint,
         vpc_id=vpc.id,
-        service_name=f"com.amazonaws.{aws.config.region}.s3",
+        service_name=f"com.amazonaws.{_REGION}.s3",
         vpc_endpoint_type="Gateway",
         route_table_ids=[private_rt.id],
-        tags={"Name": f"{project_name}-s3-endpoint", "Project": project_name}
+        tags=names.tags(names.s3_endpoint),
+        opts=_network_child(vpc)
     )
 
-    return VpcOutput(
+    # Each tier's IDs resolve together as a single Output[List[str]]
+    output = VpcOutput(
         vpc_id=vpc.id,
-        private_subnet_ids=[s.id for s in private_subnets],
-        public_subnet_ids=[s.id for s in public_subnets],
+        private_subnet_ids=pulumi.Output.all(*(s.id for s in private_subnets)),
+        public_subnet_ids=pulumi.Output.all(*(s.id for s in public_subnets)),
     )
+    network.register_outputs({
+        "vpc_id": output.vpc_id,
+        "private_subnet_ids": output.private_subnet_ids,
+        "public_subnet_ids": output.public_subnet_ids,
+    })
+    return output
 